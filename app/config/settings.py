@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import List
 
 from pydantic_settings import BaseSettings
@@ -22,4 +23,24 @@ class Settings(BaseSettings):
     model_config = {"env_file": ".env"}
 
 
-settings = Settings()
+@dataclass(frozen=True, slots=True)
+class FrozenSettings:
+    """Immutable snapshot of `Settings` with plain slot attribute access.
+
+    Fields must mirror `Settings`; app/tests/test_settings.py checks they match.
+    """
+
+    API_PREFIX: str
+    PROJECT_NAME: str
+
+    # Logging settings
+    LOG_DIR: str
+    LOG_TO_STDOUT: bool
+    LOG_LEVEL: str
+    LOG_MAX_DAYS: int
+    SERVICE_NAME: str
+
+    BACKEND_CORS_ORIGINS = Settings.BACKEND_CORS_ORIGINS
+
+
+settings = FrozenSettings(**Settings().model_dump())
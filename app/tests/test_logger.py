@@ -0,0 +1,144 @@
+import logging
+import os
+import time
+
+import pytest
+
+from app.utils.logger import AppLogger, CachedFormatter, CustomTimedRotatingFileHandler
+
+
+def _record(msg: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, None, None)
+
+
+def test_emit_rollover_reopens_base_file(tmp_path):
+    log_path = tmp_path / "svc_2026-01-01.log"
+    handler = CustomTimedRotatingFileHandler(
+        log_path,
+        when="midnight",
+        backupCount=2,
+        encoding="utf-8",
+        service_name="svc",
+    )
+    try:
+        handler.emit(_record("before rollover"))
+        handler.rolloverAt = 0  # force a rollover on the next emit
+        handler.emit(_record("after rollover"))
+    finally:
+        handler.close()
+
+    rotated = [p for p in tmp_path.iterdir() if p != log_path]
+    assert len(rotated) == 1
+    assert rotated[0].read_text(encoding="utf-8") == "before rollover\n"
+    assert log_path.read_text(encoding="utf-8") == "after rollover\n"
+
+
+def _cleanup_logger(log_dir, max_log_days):
+    """Build an AppLogger with just the state cleanup needs, skipping handler setup."""
+    app_logger = AppLogger.__new__(AppLogger)
+    app_logger._service_name = "svc"
+    app_logger._prefix_us = "svc_"
+    app_logger.log_dir = log_dir
+    app_logger._log_dir_str = os.fspath(log_dir)
+    app_logger.max_log_days = max_log_days
+    return app_logger
+
+
+def _make_logs(log_dir, *days):
+    for day in days:
+        (log_dir / f"svc_{day}.log").touch()
+
+
+def _log_names(log_dir):
+    return sorted(p.name for p in log_dir.glob("*.log"))
+
+
+def test_cleanup_keeps_most_recent_and_writes_marker(tmp_path):
+    _make_logs(tmp_path, "2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04")
+    (tmp_path / "other_2026-01-01.log").touch()
+
+    _cleanup_logger(tmp_path, 2)._cleanup_old_logs("2026-01-05")
+
+    assert _log_names(tmp_path) == [
+        "other_2026-01-01.log",
+        "svc_2026-01-03.log",
+        "svc_2026-01-04.log",
+    ]
+    assert (tmp_path / ".cleanup-svc").read_text(encoding="utf-8") == "2026-01-05 2"
+
+
+def test_cleanup_skipped_when_marker_matches(tmp_path):
+    _make_logs(tmp_path, "2026-01-01", "2026-01-02", "2026-01-03")
+    (tmp_path / ".cleanup-svc").write_text("2026-01-05 1", encoding="utf-8")
+
+    _cleanup_logger(tmp_path, 1)._cleanup_old_logs("2026-01-05")
+
+    assert len(_log_names(tmp_path)) == 3
+
+
+@pytest.mark.parametrize("stamp", ["2026-01-05 5", "2026-01-04 1"])
+def test_cleanup_runs_when_marker_is_stale(tmp_path, stamp):
+    _make_logs(tmp_path, "2026-01-01", "2026-01-02", "2026-01-03")
+    (tmp_path / ".cleanup-svc").write_text(stamp, encoding="utf-8")
+
+    _cleanup_logger(tmp_path, 1)._cleanup_old_logs("2026-01-05")
+
+    assert _log_names(tmp_path) == ["svc_2026-01-03.log"]
+    assert (tmp_path / ".cleanup-svc").read_text(encoding="utf-8") == "2026-01-05 1"
+
+
+def test_cleanup_runs_when_marker_is_not_utf8(tmp_path):
+    _make_logs(tmp_path, "2026-01-01", "2026-01-02")
+    (tmp_path / ".cleanup-svc").write_bytes(b"\xff\xfe")
+
+    _cleanup_logger(tmp_path, 1)._cleanup_old_logs("2026-01-05")
+
+    assert _log_names(tmp_path) == ["svc_2026-01-02.log"]
+
+
+def test_cleanup_with_zero_retention_keeps_only_today(tmp_path):
+    _make_logs(tmp_path, "2026-01-01", "2026-01-02", "2026-01-05")
+
+    _cleanup_logger(tmp_path, 0)._cleanup_old_logs("2026-01-05")
+
+    assert _log_names(tmp_path) == ["svc_2026-01-05.log"]
+
+
+def _record_at(created: float) -> logging.LogRecord:
+    record = _record("msg")
+    record.created = created
+    record.msecs = int((created - int(created)) * 1000)
+    return record
+
+
+def test_cached_formatters_keep_their_own_datefmt():
+    short = CachedFormatter("%(asctime)s", datefmt="%H:%M:%S")
+    long = CachedFormatter("%(asctime)s", datefmt="%Y-%m-%d %H:%M:%S")
+    created = 1767225600.25
+
+    assert short.format(_record_at(created)) == time.strftime(
+        "%H:%M:%S", time.localtime(created)
+    )
+    assert long.format(_record_at(created)) == time.strftime(
+        "%Y-%m-%d %H:%M:%S", time.localtime(created)
+    )
+
+
+def test_cached_formatter_refreshes_on_new_second():
+    formatter = CachedFormatter("%(asctime)s", datefmt="%H:%M:%S")
+    first, second = 1767225600.25, 1767225601.5
+
+    assert formatter.format(_record_at(first)) == time.strftime(
+        "%H:%M:%S", time.localtime(first)
+    )
+    assert formatter.format(_record_at(second)) == time.strftime(
+        "%H:%M:%S", time.localtime(second)
+    )
+
+
+def test_cached_formatter_without_datefmt_keeps_milliseconds():
+    formatter = CachedFormatter("%(asctime)s")
+    record = _record_at(1767225600.25)
+
+    assert formatter.format(record) == logging.Formatter("%(asctime)s").format(record)
+    assert formatter.format(record).endswith(",250")
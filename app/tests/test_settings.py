@@ -0,0 +1,14 @@
+import pickle
+from dataclasses import fields
+
+from app.config.settings import FrozenSettings, Settings, settings
+
+
+def test_frozen_settings_fields_match_settings():
+    frozen = {f.name: f.type for f in fields(FrozenSettings)}
+    expected = {name: f.annotation for name, f in Settings.model_fields.items()}
+    assert frozen == expected
+
+
+def test_settings_snapshot_pickles():
+    assert pickle.loads(pickle.dumps(settings)) == settings
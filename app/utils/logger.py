@@ -1,16 +1,75 @@
+import atexit
+import heapq
 import logging
 import logging.handlers
 import os
+import queue
 import re
-from datetime import datetime
+import time
 from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
 from app.config.settings import settings
 
+_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.FATAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARN,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+    "NOTSET": logging.NOTSET,
+}
+
+# Captures 'service_prefix' from a base filename like 'service_prefix_YYYY-MM-DD'.
+_SERVICE_PREFIX_RE = re.compile(r"^(.*?)(?:_\d{4}-\d{2}-\d{2})$")
+
+
+def _is_rotated(name: str, prefix_us: str, ext: str) -> bool:
+    """Check whether `name` has the shape `<prefix_us>YYYY-MM-DD<ext>`.
+
+    `prefix_us` is the service prefix including its trailing underscore.
+    """
+    head = len(prefix_us)
+    if len(name) != head + 10 + len(ext):
+        return False
+    if not (name.startswith(prefix_us) and name.endswith(ext)):
+        return False
+    date = name[head : head + 10]
+    return (
+        date[4] == "-"
+        and date[7] == "-"
+        and (date[:4] + date[5:7] + date[8:]).isdigit()
+    )
+
+
+class CachedFormatter(logging.Formatter):
+    """Formatter that reuses the formatted `asctime` for records in the same second."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        if not datefmt:
+            # Default format includes milliseconds, so it cannot be reused
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        last_sec, last_str = self._last
+        if sec != last_sec:
+            last_str = time.strftime(datefmt, self.converter(sec))
+            self._last = (sec, last_str)
+        return last_str
+
 
 class CustomTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
-    """Custom time-based rotating file handler with timestamped filenames."""
+    """Custom time-based rotating file handler with timestamped filenames.
+
+    Records are written with a single `os.write` on an `O_APPEND` descriptor
+    instead of going through a buffered text stream that is flushed per record.
+    """
 
     def __init__(
         self,
@@ -24,15 +83,74 @@ class CustomTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
         atTime=None,
         service_name=None,
     ):
+        # The base class never opens its own stream; writes go through self._fd.
         super().__init__(
-            filename, when, interval, backupCount, encoding, delay, utc, atTime
+            filename, when, interval, backupCount, encoding, True, utc, atTime
         )
         self.service_name = service_name or "app"
+        self._encoding = encoding or "utf-8"
+        self._fd = None
+        if not delay:
+            self._fd = self._open_fd()
+
+        # baseFilename is fixed for the handler's lifetime, so derive the rotated
+        # filename parts once instead of on every rollover.
+        self._dir_name = os.path.dirname(self.baseFilename)
+        self._base_name = os.path.basename(self.baseFilename)
+        self._ext = os.path.splitext(self._base_name)[1]  # '.log'
+        base_without_ext = (
+            self._base_name[: -len(self._ext)] if self._ext else self._base_name
+        )
+        # Derive the stable service prefix from the current base filename which is typically
+        # like 'service_prefix_YYYY-MM-DD'. We want to capture 'service_prefix'.
+        match = _SERVICE_PREFIX_RE.match(base_without_ext)
+        self._service_prefix = (
+            match.group(1) if match else base_without_ext.rsplit("_", 1)[0]
+        )
+        self._prefix_us = self._service_prefix + "_"
+
+    def _open_fd(self) -> int:
+        """Open the current log file for appending and return its descriptor."""
+        # 0o666 leaves the final permissions to the umask, like the builtin open()
+        return os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+
+    def _close_fd(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def emit(self, record):
+        """Roll over if due, then append the formatted record in one write."""
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self._fd is None:
+                self._fd = self._open_fd()
+            msg = self.format(record) + self.terminator
+            buf = memoryview(msg.encode(self._encoding))
+            # os.write may write fewer bytes than requested (e.g. signal, full disk)
+            while buf:
+                buf = buf[os.write(self._fd, buf) :]
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self):
+        """Close the descriptor before rotating; it is reopened on the next emit."""
+        self._close_fd()
+        super().doRollover()
+
+    def close(self):
+        self.acquire()
+        try:
+            self._close_fd()
+        finally:
+            self.release()
+        super().close()
 
     def rotation_filename(self, default_name):
         """Create rotation filename with timestamp."""
         base, ext = os.path.splitext(self.baseFilename)
-        timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M")
+        timestamp = time.strftime("%Y-%m-%d-%H-%M")
         return f"{base}-{timestamp}{ext}"
 
     def getFilesToDelete(self):
@@ -40,53 +158,47 @@ class CustomTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
         Determine the log files to delete when we exceed backupCount.
         Keeps only the most recent `backupCount` files.
         """
-        dirName, baseName = os.path.dirname(self.baseFilename), os.path.basename(
-            self.baseFilename
-        )
-        # Pattern matches: service_prefix_YYYY-MM-DD.ext
-        fileNames = os.listdir(dirName)
+        ext, prefix_us = self._ext, self._prefix_us
         rotated = []
-        ext = os.path.splitext(baseName)[1]  # '.log'
-        base_without_ext = baseName[: -len(ext)] if ext else baseName
-        # Derive the stable service prefix from the current base filename which is typically
-        # like 'service_prefix_YYYY-MM-DD'. We want to capture 'service_prefix'.
-        match = re.match(r"^(.*?)(?:_\d{4}-\d{2}-\d{2})$", base_without_ext)
-        service_prefix = match.group(1) if match else base_without_ext.rsplit("_", 1)[0]
-        pattern = re.compile(
-            rf"^{re.escape(service_prefix)}_\d{{4}}-\d{{2}}-\d{{2}}{re.escape(ext)}$"
-        )
-        for fn in fileNames:
-            if pattern.match(fn):
-                rotated.append(os.path.join(dirName, fn))
-        rotated.sort()  # oldest first (lexicographic on timestamp)
+        # Matches: service_prefix_YYYY-MM-DD.ext
+        with os.scandir(self._dir_name) as it:
+            for entry in it:
+                if entry.is_file() and _is_rotated(entry.name, prefix_us, ext):
+                    end = len(entry.name) - len(ext)
+                    rotated.append((entry.name[end - 10 : end], entry.path))
         # delete older if more than backupCount
-        if len(rotated) <= self.backupCount:
+        excess = len(rotated) - self.backupCount
+        if excess <= 0:
             return []
-        return rotated[: len(rotated) - self.backupCount]
+        # Only the oldest `excess` files are needed (on the YYYY-MM-DD part)
+        oldest = heapq.nsmallest(excess, rotated, key=itemgetter(0))
+        return [path for _, path in oldest]
 
 
 class AppLogger:
-    """Singleton logger class with simplified method names and built-in configuration."""
+    """Logger class with simplified method names and built-in configuration.
 
-    __instance = None
+    A single shared instance is provided by `get_logger()`.
+    """
 
-    def __new__(cls):
-        if cls.__instance is None:
-            instance = super(AppLogger, cls).__new__(cls)
-            instance._setup_logger()
-            cls.__instance = instance
-        return cls.__instance
+    def __init__(self) -> None:
+        self._setup_logger()
+        if settings.LOG_LEVEL.upper() not in _LEVELS:
+            self.warn(f"Unknown LOG_LEVEL {settings.LOG_LEVEL!r}, falling back to INFO")
 
     def _setup_logger(self) -> None:
         """Set up the logger with file and console handlers."""
         self._service_name: str = settings.SERVICE_NAME
+        self._prefix_us: str = f"{self._service_name}_"
         self.log_dir: Path = Path(settings.LOG_DIR)
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._log_dir_str: str = os.fspath(self.log_dir)
         self.log_to_stdout: bool = settings.LOG_TO_STDOUT
         self.max_log_days: int = settings.LOG_MAX_DAYS
-        self.log_level: int = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
+        self.log_level: int = _LEVELS.get(settings.LOG_LEVEL.upper(), logging.INFO)
 
-        self._cleanup_old_logs()
+        today_str = time.strftime("%Y-%m-%d")
+        self._cleanup_old_logs(today_str)
 
         self.logger = logging.getLogger(self._service_name.upper())
         self.logger.setLevel(self.log_level)
@@ -94,16 +206,16 @@ class AppLogger:
         if self.logger.handlers:
             return
 
-        detailed_formatter = logging.Formatter(
+        detailed_formatter = CachedFormatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
         )
 
-        simple_formatter = logging.Formatter(
+        simple_formatter = CachedFormatter(
             "%(asctime)s - %(levelname)s - %(message)s", datefmt="%H:%M:%S"
         )
 
-        log_file = f"{self._service_name}_{datetime.now().strftime('%Y-%m-%d')}.log"
+        log_file = f"{self._service_name}_{today_str}.log"
         log_path = self.log_dir / log_file
 
         file_handler = CustomTimedRotatingFileHandler(
@@ -116,67 +228,96 @@ class AppLogger:
         )
         file_handler.setLevel(self.log_level)
         file_handler.setFormatter(detailed_formatter)
-        self.logger.addHandler(file_handler)
+        handlers = [file_handler]
 
         # Console handler
         if self.log_to_stdout:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(self.log_level)
             console_handler.setFormatter(simple_formatter)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
+
+        # QueueHandler.prepare still merges the message args and renders any
+        # traceback in the calling thread (so lazy formatting at call sites still
+        # matters); the handlers' own formatting and the I/O run on a background
+        # listener thread so request handlers never wait on the file lock.
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self._listener.stop)
 
-    def _cleanup_old_logs(self) -> None:
+    def _cleanup_old_logs(self, today_str: str) -> None:
         """Remove old log files beyond the retention count at app start.
 
-        Keeps only the most recent `self.max_log_days` files matching pattern
-        `<service_name>_YYYY-MM-DD.log` within `self.log_dir`.
+        Runs at most once per day per service and retention: the
+        `.cleanup-<service_name>` marker in `self.log_dir` holds the date and
+        `max_log_days` of the last completed cleanup, so further processes started
+        the same day with the same retention skip the directory scan.
         """
+        marker = self._log_dir_str + os.sep + f".cleanup-{self._service_name}"
+        stamp = f"{today_str} {self.max_log_days}"
         try:
-            if self.max_log_days is None:
-                return
-            # Guard against misconfiguration
-            if self.max_log_days < 1:
-                # If set to 0 or negative, delete all matching logs except today's
-                retention_count = 0
-            else:
-                retention_count = self.max_log_days
-
-            # Build filename pattern and collect candidates
-            ext = ".log"
-            pattern = re.compile(
-                rf"^{re.escape(self._service_name)}_\d{{4}}-\d{{2}}-\d{{2}}{re.escape(ext)}$"
-            )
-
-            # Current active log file (today) should be preserved even if retention is 0
-            today_name = (
-                f"{self._service_name}_{datetime.now().strftime('%Y-%m-%d')}{ext}"
-            )
-
-            candidates = []
-            for fn in os.listdir(self.log_dir):
-                if pattern.match(fn):
-                    candidates.append(fn)
-
-            if not candidates:
-                return
-
-            # Sort by date derived from filename (lexicographic works for YYYY-MM-DD)
-            candidates.sort()
-            keep_set = (
-                set(candidates[-retention_count:]) if retention_count > 0 else set()
-            )
-            keep_set.add(today_name)
-
-            for fn in candidates:
-                if fn not in keep_set:
-                    full_path = self.log_dir / fn
-                    try:
-                        os.remove(full_path)
-                    except OSError:
-                        pass
+            with open(marker, encoding="utf-8") as f:
+                if f.read() == stamp:
+                    return
+        except (OSError, ValueError):
+            # Missing or unreadable (e.g. not UTF-8) marker: just run cleanup
+            pass
+
+        try:
+            self._remove_old_logs(today_str)
+            # Concurrent workers may race here; at worst cleanup runs twice
+            with open(marker, "w", encoding="utf-8") as f:
+                f.write(stamp)
         except Exception:
             pass
 
+    def _remove_old_logs(self, today_str: str) -> None:
+        """Delete log files beyond the retention count.
+
+        Keeps only the most recent `self.max_log_days` files matching pattern
+        `<service_name>_YYYY-MM-DD.log` within `self.log_dir`.
+        """
+        if self.max_log_days is None:
+            return
+        # Guard against misconfiguration
+        if self.max_log_days < 1:
+            # If set to 0 or negative, delete all matching logs except today's
+            retention_count = 0
+        else:
+            retention_count = self.max_log_days
+
+        ext = ".log"
+
+        # Current active log file (today) should be preserved even if retention is 0
+        today_name = f"{self._service_name}_{today_str}{ext}"
+
+        # (date, filename) pairs matching `<service_name>_YYYY-MM-DD.log`
+        candidates = []
+        with os.scandir(self._log_dir_str) as it:
+            for entry in it:
+                if entry.is_file() and _is_rotated(entry.name, self._prefix_us, ext):
+                    end = len(entry.name) - len(ext)
+                    candidates.append((entry.name[end - 10 : end], entry.name))
+
+        # Nothing can exceed the retention window, skip sorting and deletion
+        if len(candidates) <= retention_count:
+            return
+
+        # Sort by the date parsed from the filename, oldest first
+        candidates.sort()
+        to_delete = candidates[:-retention_count] if retention_count > 0 else candidates
+        to_delete = [fn for _, fn in to_delete if fn != today_name]
+
+        for fn in to_delete:
+            try:
+                os.remove(self._log_dir_str + os.sep + fn)
+            except OSError:
+                pass
+
     def crit(self, msg: str, exc_info: bool = False) -> None:
         """Log critical message."""
         return self.logger.critical(msg=msg, exc_info=exc_info)
@@ -199,17 +340,24 @@ class AppLogger:
 
     def exception(self, exc: Exception, context: str = "") -> None:
         """Log an exception with proper formatting."""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         context_msg = f" in {context}" if context else ""
         self.logger.error(
-            f"Exception occurred{context_msg}: {type(exc).__name__}: {exc}",
+            "Exception occurred%s: %s: %s",
+            context_msg,
+            type(exc).__name__,
+            exc,
             exc_info=True,
         )
 
     def perf(self, operation: str, duration: float, **context) -> None:
         """Log performance metrics."""
-        context_str = ", ".join([f"{k}={v}" for k, v in context.items()])
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        context_str = ", ".join(f"{k}={v}" for k, v in context.items())
         self.logger.info(
-            f"Performance: {operation} took {duration:.3f}s ({context_str})"
+            "Performance: %s took %.3fs (%s)", operation, duration, context_str
         )
 
 